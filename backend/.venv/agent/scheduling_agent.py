@@ -0,0 +1,361 @@
+# agent/scheduling_agent.py
+import asyncio
+import uuid
+import re
+import datetime
+from typing import Dict, Any, Optional, List, Tuple
+from rag.faq_rag import FAQRAG
+from agent.session_store import Session, make_session_store
+from observability import metrics
+
+# import calendly helpers (unchanged)
+from api.calendly_integration import get_availability_range, create_booking
+
+# Session store with TTL + LRU eviction; backend picked by SESSION_STORE (memory | sqlite)
+SESSIONS = make_session_store()
+metrics.register_gauge("chat_active_sessions", "Sessions currently held by the session store.", lambda: len(SESSIONS))
+
+# fixed FAQ lookups behind the canned intents; answers are precomputed by warm_up()
+CANNED_FAQ_QUERIES = {"ask_hours": "hours", "ask_insurance": "insurance", "ask_location": "location"}
+
+# how many days past the preferred date to look for alternatives, and how many slots to offer
+ALTERNATIVE_DAYS = 14
+SUGGESTED_SLOTS = 5
+
+TIME_RE = re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)\b")
+ISO_DATE_RE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+
+def classify_intent(message: str) -> str:
+    """
+    Very small rule-based intent classifier.
+    Returns one of:
+      - "book_appointment"
+      - "ask_hours"
+      - "ask_insurance"
+      - "ask_phone"
+      - "small_talk"
+      - "unknown" (fallback to FAQ)
+    """
+    m = message.lower().strip()
+    # greetings
+    if any(g in m for g in ["hi", "hello", "hey", "good morning", "good afternoon", "good evening"]):
+        # If message is only greeting, return small_talk
+        if len(m.split()) <= 2:
+            return "small_talk"
+
+    # booking keywords
+    if any(k in m for k in ["book", "appointment", "schedule", "see the doctor", "i need to see", "i want to book", "reserve"]):
+        return "book_appointment"
+
+    # time or date alone could indicate booking continuation
+    if TIME_RE.search(m) or ISO_DATE_RE.search(m):
+        # Likely a booking flow message (time/date selection), but not forcing booking start
+        return "maybe_time_or_date"
+
+    # hours / open
+    if any(k in m for k in ["hour", "open", "opening", "when open", "hours"]):
+        return "ask_hours"
+
+    # insurance
+    if any(k in m for k in ["insurance", "insurer", "coverage", "copay", "billing"]):
+        return "ask_insurance"
+
+    # phone/contact
+    if any(k in m for k in ["phone", "call", "contact", "number", "clinic phone"]):
+        return "ask_phone"
+
+    # ask location / address
+    if any(k in m for k in ["address", "location", "where are you", "directions"]):
+        return "ask_location"
+
+    # fallback to unknown -> use RAG/FAQ
+    return "unknown"
+
+def parse_time(text: str) -> Optional[str]:
+    """Return HH:MM if found, else None"""
+    m = TIME_RE.search(text)
+    if not m:
+        return None
+    hh = int(m.group(1))
+    mm = int(m.group(2))
+    return f"{hh:02d}:{mm:02d}"
+
+def parse_date(text: str) -> Optional[str]:
+    """Return ISO date if found and valid"""
+    m = ISO_DATE_RE.search(text)
+    if not m:
+        return None
+    try:
+        datetime.date.fromisoformat(m.group(1))
+        return m.group(1)
+    except Exception:
+        return None
+
+def pick_suggested(slots: List[Dict[str, Any]], time_val: Optional[str], date_val: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Suggested slot starting at time_val (and on date_val, if given), else None"""
+    for s in slots:
+        if s.get("start_time") == time_val and (not date_val or s.get("date") == date_val):
+            return s
+    return None
+
+class FAQLookup:
+    """Returned by SchedulingAgent._respond when the reply needs a (possibly slow) FAQ lookup."""
+    __slots__ = ("query",)
+
+    def __init__(self, query: str):
+        self.query = query
+
+class SchedulingAgent:
+    def __init__(self):
+        self.rag = FAQRAG()
+
+    def warm_up(self):
+        """Build the FAQ index and pin the canned intent answers (call once at startup)."""
+        self.rag.precompute({q: 2 for q in CANNED_FAQ_QUERIES.values()})
+
+    def new_session(self):
+        sid = uuid.uuid4().hex
+        SESSIONS.save(sid, Session())
+        return sid
+
+    def _ensure_session(self, session_id: Optional[str]) -> Tuple[str, Session]:
+        if not session_id:
+            session_id = uuid.uuid4().hex
+        sess = SESSIONS.get(session_id)
+        if sess is None:
+            # unknown or expired session: start over in the same id
+            sess = Session()
+        return session_id, sess
+
+    def _step(self, session_id: Optional[str], message: str, labels: Dict[str, str]):
+        # ensure session
+        with metrics.span("load_session"):
+            session_id, sess = self._ensure_session(session_id)
+        labels["state"] = sess.state
+
+        # record incoming message (history is capped per session)
+        sess.add_message("user", message)
+        try:
+            return session_id, self._respond(session_id, sess, message, labels)
+        finally:
+            # write back so shared backends see this turn's state
+            with metrics.span("save_session"):
+                SESSIONS.save(session_id, sess)
+
+    def _step_profiled(self, session_id: Optional[str], message: str, labels: Dict[str, str]):
+        # the profiler samples the thread that enters watch(), so this runs in the worker;
+        # the FAQ search is profiled in its own thread (FAQRAG._db_query)
+        with metrics.profile_if_slow("handle_message_async"):
+            return self._step(session_id, message, labels)
+
+    def handle_message(self, session_id: Optional[str], message: str):
+        start = metrics.now()
+        labels = {"intent": "unknown", "state": "idle"}
+        with metrics.profile_if_slow("handle_message"):
+            session_id, resp = self._step(session_id, message, labels)
+            if isinstance(resp, FAQLookup):
+                with metrics.span("faq_query"):
+                    resp = {"session_id": session_id, "type": "faq", "answer": self.rag.query(resp.query)}
+        metrics.observe_request(start, labels["intent"], labels["state"])
+        return resp
+
+    async def handle_message_async(self, session_id: Optional[str], message: str):
+        """
+        Same as handle_message, for the async endpoint. The conversation step
+        runs in a worker thread, since session load/save and booking can block
+        on the SQLite stores; only the FAQ lookup is awaited on the event loop
+        (with a timeout, see FAQRAG.aquery). The session is saved before that
+        await, so a cancelled request leaves it consistent.
+        """
+        start = metrics.now()
+        labels = {"intent": "unknown", "state": "idle"}
+        session_id, resp = await asyncio.to_thread(self._step_profiled, session_id, message, labels)
+        if isinstance(resp, FAQLookup):
+            with metrics.span("faq_query"):
+                resp = {"session_id": session_id, "type": "faq", "answer": await self.rag.aquery(resp.query)}
+        metrics.observe_request(start, labels["intent"], labels["state"])
+        return resp
+
+    def _respond(self, session_id: str, sess: Session, message: str, labels: Dict[str, str]):
+        msg = message.strip()
+        lower = msg.lower()
+
+        # quick parse for time/date/patient-csv to allow "out of order" inputs
+        with metrics.span("parse"):
+            time_val = parse_time(msg)
+            date_val = parse_date(msg)
+
+            # Recognize CSV-like patient info: "Name, phone, email"
+            parts = [p.strip() for p in msg.split(",")]
+            looks_like_patient = False
+            if len(parts) >= 3:
+                # basic email check for last part
+                if "@" in parts[-1] and len(parts[0].split()) >= 1:
+                    looks_like_patient = True
+
+        # classify intent (rule-based)
+        with metrics.span("classify_intent"):
+            intent = classify_intent(msg)
+        labels["intent"] = intent
+
+        # ---------- If we're mid-booking state, prefer that flow ----------
+        state = sess.state
+        ctx = sess.context
+
+        # If currently in flow where we expect date/time/etc, continue that
+        if state == "booking_needs" and ctx.get("asked_type"):
+            # user should answer appointment type
+            appt_type = "consultation"
+            if "follow" in lower: appt_type = "followup"
+            if "physical" in lower: appt_type = "physical"
+            if "special" in lower: appt_type = "specialist"
+            ctx["appointment_type"] = appt_type
+            ctx["asked_type"] = False
+            ctx["asked_pref"] = True
+            sess.state = "asking_pref"
+            return {"session_id": session_id, "type": "question", "question": "Do you have a preferred date? (YYYY-MM-DD) or preference like 'this week' / 'tomorrow' / 'no preference'"}
+
+        if state == "asking_pref" and ctx.get("asked_pref"):
+            pref = msg.lower()
+            tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+            target = None
+            # days to search from target_date; alternatives come from later days in the same call
+            window = ALTERNATIVE_DAYS
+            if pref == "tomorrow":
+                target = tomorrow
+            elif pref == "this week":
+                target = tomorrow
+                window = 7
+            elif pref in ("no preference", "any", "whenever"):
+                target = tomorrow
+            else:
+                # if user provided an ISO date anywhere, use it
+                if date_val:
+                    target = datetime.date.fromisoformat(date_val)
+                else:
+                    # try to parse plain text date words? Not implemented; fallback to the day after tomorrow
+                    try:
+                        # attempt ISO parse of the whole message (also accepts e.g. 20301020)
+                        target = datetime.date.fromisoformat(pref)
+                    except Exception:
+                        target = tomorrow + datetime.timedelta(days=1)
+
+            # a past date would otherwise come back with past slots as "next available"
+            target = max(target, tomorrow)
+            # normalized, so it compares equal to the slots' "date" below
+            target_date = target.isoformat()
+            ctx["target_date"] = target_date
+            sess.state = "suggesting_slots"
+            # get availability across the window in one call
+            end_date = (target + datetime.timedelta(days=window - 1)).isoformat()
+            avail = get_availability_range(start_date=target_date, end_date=end_date,
+                                           appointment_type=ctx.get("appointment_type", "consultation"),
+                                           limit=SUGGESTED_SLOTS)
+            suggested = avail.get("slots", [])
+            if not suggested:
+                sess.state = "idle"
+                return {"session_id": session_id, "type": "no_slots", "message": f"No slots available from {target_date} to {end_date}. Would you like to try other dates?"}
+            ctx["suggested_slots"] = suggested
+            resp = {"session_id": session_id, "type": "suggest_slots", "slots": suggested}
+            if suggested[0]["date"] != target_date and window == ALTERNATIVE_DAYS:
+                resp["message"] = f"No slots left on {target_date}; here are the next available ones."
+            return resp
+
+        if state == "suggesting_slots":
+            # user picks a time like '10:00' (optionally with its date) or 'none'
+            if "none" in lower or lower in ("no", "not now"):
+                sess.state = "idle"
+                return {"session_id": session_id, "type": "question", "question": "Okay — would you like me to check other dates? (yes/no)"}
+            # If the message contains a HH:MM, use it
+            if time_val:
+                chosen = time_val
+            else:
+                # some frontends send just e.g. "09:00" or a word; fallback to first token
+                chosen = msg.split()[0] if msg.split() else ""
+            # validate chosen is in suggested slots
+            s = pick_suggested(ctx.get("suggested_slots", []), chosen, date_val)
+            if s:
+                ctx["chosen_slot"] = s
+                ctx["target_date"] = s.get("date", ctx.get("target_date"))
+                sess.state = "collect_info"
+                return {"session_id": session_id, "type": "question", "question": "Please provide your full name, phone, and email (comma separated)."}
+            # If user typed a time not in suggestions, handle gracefully
+            return {"session_id": session_id, "type": "error", "message": "Time not recognized. Reply with HH:MM from the suggested list."}
+
+        if state == "collect_info":
+            # Accept patient CSV
+            if looks_like_patient:
+                patient = {"name": parts[0], "phone": parts[1], "email": parts[2]}
+                ctx["patient"] = patient
+                # perform booking via create_booking helper
+                payload = {
+                    "appointment_type": ctx.get("appointment_type", "consultation"),
+                    "date": ctx.get("target_date"),
+                    "start_time": ctx.get("chosen_slot", {}).get("start_time"),
+                    "patient": patient,
+                    "reason": "Booked via agent"
+                }
+                br = create_booking(payload)
+                sess.state = "idle"
+                return {"session_id": session_id, "type": "booking_conf", "booking": br}
+            else:
+                # ask again
+                return {"session_id": session_id, "type": "question", "question": "Please provide name, phone, email separated by commas."}
+
+        # ---------- Not currently in booking flow ----------
+        # If the classifier strongly indicates booking, start booking flow
+        if intent == "book_appointment":
+            sess.state = "booking_needs"
+            ctx["asked_type"] = True
+            return {"session_id": session_id, "type": "question", "question": "Sure — what type of appointment? (consultation, followup, physical, specialist)"}
+
+        # If message looks like a time and the session has suggested slots, accept it even if we weren't in suggesting_slots
+        if time_val and ctx.get("suggested_slots"):
+            s = pick_suggested(ctx.get("suggested_slots", []), time_val, date_val)
+            if s:
+                ctx["chosen_slot"] = s
+                ctx["target_date"] = s.get("date", ctx.get("target_date"))
+                sess.state = "collect_info"
+                return {"session_id": session_id, "type": "question", "question": "Please provide your full name, phone, and email (comma separated)."}
+            return {"session_id": session_id, "type": "error", "message": "Time not recognized. Reply with HH:MM from the suggested list."}
+
+        # If message looks like patient CSV but we already have a chosen slot (maybe user pasted CSV first), handle that
+        if looks_like_patient and ctx.get("chosen_slot"):
+            patient = {"name": parts[0], "phone": parts[1], "email": parts[2]}
+            ctx["patient"] = patient
+            payload = {
+                "appointment_type": ctx.get("appointment_type", "consultation"),
+                "date": ctx.get("target_date"),
+                "start_time": ctx.get("chosen_slot", {}).get("start_time"),
+                "patient": patient,
+                "reason": "Booked via agent"
+            }
+            br = create_booking(payload)
+            sess.state = "idle"
+            return {"session_id": session_id, "type": "booking_conf", "booking": br}
+
+        # yes/no handling for alternative prompts when idle
+        if state == "idle" and lower in ("yes", "y", "sure", "ok", "please"):
+            # if there were no suggested slots but user said yes to alternatives, ask for date preference
+            sess.state = "asking_pref"
+            ctx["asked_pref"] = True
+            return {"session_id": session_id, "type": "question", "question": "Which date would you like me to check? (YYYY-MM-DD / tomorrow / this week / no preference)"}
+        if state == "idle" and lower in ("no", "n", "nah"):
+            return {"session_id": session_id, "type": "question", "question": "Okay — anything else I can help with?"}
+
+        # mapped intents to quick replies / FAQ
+        if intent == "ask_hours":
+            return FAQLookup(CANNED_FAQ_QUERIES[intent])
+        if intent == "ask_insurance":
+            return FAQLookup(CANNED_FAQ_QUERIES[intent])
+        if intent == "ask_phone":
+            # return phone as faq-like response
+            ans = f"Our clinic phone is {ctx.get('clinic_phone','(unknown)')}."
+            return {"session_id": session_id, "type": "faq", "answer": ans}
+        if intent == "ask_location":
+            return FAQLookup(CANNED_FAQ_QUERIES[intent])
+        if intent == "small_talk":
+            return {"session_id": session_id, "type": "question", "question": "Hi! How can I help you today? You can say 'Book an appointment' or ask about hours, insurance, or location."}
+
+        # fallback to RAG/FAQ for unknown intent
+        return FAQLookup(message)
@@ -0,0 +1,218 @@
+# agent/session_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "./data/sessions.sqlite3")
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_MAX = int(os.getenv("SESSION_MAX", "10000"))
+SESSION_MAX_MESSAGES = int(os.getenv("SESSION_MAX_MESSAGES", "20"))
+
+
+def _message_log() -> Deque[Tuple[str, str, float]]:
+    return deque(maxlen=SESSION_MAX_MESSAGES)
+
+
+@dataclass(slots=True)
+class Session:
+    """
+    One conversation. `messages` keeps only the last SESSION_MAX_MESSAGES
+    entries as (sender, text, unix_ts) tuples. `version` is the stored row
+    version this copy was loaded at (shared stores only; not serialized).
+    """
+    state: str = "idle"
+    context: Dict[str, Any] = field(default_factory=dict)
+    messages: Deque[Tuple[str, str, float]] = field(default_factory=_message_log)
+    version: int = 0
+
+    def add_message(self, sender: str, text: str) -> None:
+        self.messages.append((sender, text, time.time()))
+
+    def to_json(self) -> str:
+        return json.dumps({"state": self.state, "context": self.context, "messages": list(self.messages)})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Session":
+        d = json.loads(raw)
+        messages = _message_log()
+        messages.extend(tuple(m) for m in d.get("messages", []))
+        return cls(state=d.get("state", "idle"), context=d.get("context", {}), messages=messages)
+
+
+class SessionConflictError(RuntimeError):
+    """Another request saved the session after this copy was loaded."""
+
+
+class SessionStore(ABC):
+    """
+    Where SchedulingAgent keeps sessions. Sessions idle for longer than
+    `ttl` seconds expire, and at most `max_sessions` are kept (least
+    recently used are evicted first).
+    """
+
+    def __init__(self, ttl: float = SESSION_TTL_SECONDS, max_sessions: int = SESSION_MAX):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Session]:
+        ...
+
+    @abstractmethod
+    def save(self, session_id: str, session: Session) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+
+class InMemorySessionStore(SessionStore):
+    """Per-process LRU. Touch order equals time order, so expired sessions sit at the front."""
+
+    def __init__(self, ttl: float = SESSION_TTL_SECONDS, max_sessions: int = SESSION_MAX):
+        super().__init__(ttl, max_sessions)
+        self._data: "OrderedDict[str, Tuple[float, Session]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._data:
+            sid, (touched, _) = next(iter(self._data.items()))
+            if now - touched <= self.ttl and len(self._data) <= self.max_sessions:
+                break
+            del self._data[sid]
+
+    def get(self, session_id: str) -> Optional[Session]:
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            item = self._data.get(session_id)
+            if item is None:
+                return None
+            self._data[session_id] = (now, item[1])
+            self._data.move_to_end(session_id)
+            return item[1]
+
+    def save(self, session_id: str, session: Session) -> None:
+        now = time.time()
+        with self._lock:
+            self._data[session_id] = (now, session)
+            self._data.move_to_end(session_id)
+            self._evict(now)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def __len__(self) -> int:
+        # drop expired sessions first so the count only covers live ones
+        with self._lock:
+            self._evict(time.time())
+            return len(self._data)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions shared by every worker on the host, so a conversation survives
+    the load balancer sending the next message elsewhere. Expired rows are
+    purged and the LRU cap enforced every `sweep_every` saves.
+
+    Reads don't write: `save` refreshes `touched`, so a chat turn is one
+    write transaction. Each row carries a version; `save` only replaces the
+    version the session was loaded at and raises SessionConflictError if
+    another worker saved in between.
+    """
+
+    def __init__(self, path: str = SESSION_DB_PATH, ttl: float = SESSION_TTL_SECONDS,
+                 max_sessions: int = SESSION_MAX, sweep_every: int = 100):
+        super().__init__(ttl, max_sessions)
+        self.path = path
+        self.sweep_every = sweep_every
+        self._saves = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, touched REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_touched ON sessions (touched)")
+        if "version" not in {r[1] for r in conn.execute("PRAGMA table_info(sessions)")}:
+            conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> Optional[Session]:
+        row = self._conn().execute(
+            "SELECT data, version FROM sessions WHERE session_id = ? AND touched >= ?",
+            (session_id, time.time() - self.ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        sess = Session.from_json(row[0])
+        sess.version = row[1]
+        return sess
+
+    def save(self, session_id: str, session: Session) -> None:
+        now = time.time()
+        # an expired row is fair game: get() didn't return it, so nobody holds a copy worth protecting
+        cur = self._conn().execute(
+            "INSERT INTO sessions (session_id, touched, data, version) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET touched = excluded.touched, data = excluded.data, "
+            "version = excluded.version WHERE sessions.version = ? OR sessions.touched < ?",
+            (session_id, now, session.to_json(), session.version + 1, session.version, now - self.ttl),
+        )
+        if cur.rowcount == 0:
+            raise SessionConflictError(f"session {session_id} was updated by another request")
+        session.version += 1
+        self._saves += 1
+        if self._saves % self.sweep_every == 0:
+            self.sweep()
+
+    def sweep(self) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM sessions WHERE touched < ?", (time.time() - self.ttl,))
+        conn.execute(
+            "DELETE FROM sessions WHERE session_id IN "
+            "(SELECT session_id FROM sessions ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,),
+        )
+
+    def delete(self, session_id: str) -> None:
+        self._conn().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def __len__(self) -> int:
+        # expired rows wait for the next sweep; don't count them
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM sessions WHERE touched >= ?", (time.time() - self.ttl,)
+        ).fetchone()[0]
+
+
+def make_session_store(kind: Optional[str] = None) -> SessionStore:
+    """Build the store selected by SESSION_STORE ("memory" or "sqlite")."""
+    kind = (kind or SESSION_STORE).lower()
+    if kind == "sqlite":
+        return SQLiteSessionStore()
+    if kind == "memory":
+        return InMemorySessionStore()
+    raise ValueError(f"unknown SESSION_STORE: {kind}")
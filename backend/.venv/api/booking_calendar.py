@@ -0,0 +1,102 @@
+# api/booking_calendar.py
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, Iterator, List, Tuple
+
+
+def to_minutes(ts: str) -> int:
+    """'HH:MM' -> minutes since midnight"""
+    hh, mm = map(int, ts.split(":"))
+    return hh * 60 + mm
+
+
+def fmt_minutes(minutes: int) -> str:
+    """minutes since midnight -> 'HH:MM' (wraps past midnight like datetime.time does)"""
+    hh, mm = divmod(minutes % (24 * 60), 60)
+    return f"{hh:02d}:{mm:02d}"
+
+
+class _Day:
+    """
+    One day's bookings as parallel lists sorted by start minute.
+    Bookings never overlap (every insert goes through a conflict check),
+    so the ends are sorted too, which is what makes bisect lookups valid.
+    """
+    __slots__ = ("starts", "ends", "bookings")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.bookings: List[Dict[str, Any]] = []
+
+
+class BookingCalendar:
+    """
+    Bookings indexed by date. Each day is kept as sorted, non-overlapping
+    [start, end) minute intervals so a conflict check is a single bisect
+    and a whole day's slot grid comes out of one merge-style pass (`slot_grid`).
+    """
+
+    def __init__(self):
+        self._days: Dict[str, _Day] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for day in self._days.values():
+            yield from day.bookings
+
+    def bookings(self, date: str) -> List[Dict[str, Any]]:
+        day = self._days.get(date)
+        return list(day.bookings) if day else []
+
+    def conflicts(self, date: str, start: int, end: int) -> bool:
+        """True if any booking on `date` overlaps [start, end) (minutes)."""
+        day = self._days.get(date)
+        if day is None:
+            return False
+        # bookings before idx start before `end`; of those only the last one
+        # can still be running at `start`
+        idx = bisect_left(day.starts, end)
+        return idx > 0 and day.ends[idx - 1] > start
+
+    def add(self, booking: Dict[str, Any], start: int, end: int) -> None:
+        """
+        Insert a booking occupying [start, end) on booking["date"].
+        Callers are expected to have checked `conflicts` first.
+        """
+        day = self._days.get(booking["date"])
+        if day is None:
+            day = self._days[booking["date"]] = _Day()
+        idx = bisect_right(day.starts, start)
+        day.starts.insert(idx, start)
+        day.ends.insert(idx, end)
+        day.bookings.insert(idx, booking)
+        self._count += 1
+
+    def intervals(self, date: str) -> Tuple[List[int], List[int]]:
+        """The day's (starts, ends) minute lists, sorted by start."""
+        day = self._days.get(date)
+        return (day.starts, day.ends) if day else ([], [])
+
+
+def slot_grid(starts: List[int], ends: List[int], open_min: int, close_min: int,
+              duration: int, step: int = 15) -> List[Tuple[int, int, bool]]:
+    """
+    Candidate slots of `duration` minutes every `step` minutes between
+    open_min and close_min, as (start, end, available) tuples.
+    `starts`/`ends` are one day's non-overlapping bookings sorted by start.
+    """
+    n = len(starts)
+    i = 0
+    out: List[Tuple[int, int, bool]] = []
+    for s in range(open_min, close_min, step):
+        e = s + duration
+        if e > close_min:
+            break
+        # bookings that ended by `s` can't overlap this or any later slot
+        while i < n and ends[i] <= s:
+            i += 1
+        out.append((s, e, not (i < n and starts[i] < e)))
+    return out
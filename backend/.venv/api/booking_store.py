@@ -0,0 +1,228 @@
+# api/booking_store.py
+import json
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+
+from api.booking_calendar import BookingCalendar, slot_grid
+
+BOOKING_STORE = os.getenv("BOOKING_STORE", "memory")
+BOOKING_DB_PATH = os.getenv("BOOKING_DB_PATH", "./data/bookings.sqlite3")
+BOOKING_DB_POOL_SIZE = int(os.getenv("BOOKING_DB_POOL_SIZE", "5"))
+
+
+class BookingStore(ABC):
+    """
+    Interface the calendly routes talk to. Bookings on a date never overlap,
+    so `try_book` must do the conflict check and the insert atomically.
+    Times are minutes since midnight; a booking is a dict with at least "date".
+    """
+
+    @abstractmethod
+    def conflicts(self, date: str, start: int, end: int) -> bool:
+        ...
+
+    @abstractmethod
+    def try_book(self, booking: Dict[str, Any], start: int, end: int) -> bool:
+        """Insert `booking` over [start, end) unless it conflicts. Returns True if stored."""
+
+    @abstractmethod
+    def intervals(self, date: str) -> Tuple[List[int], List[int]]:
+        """The day's (starts, ends) minute lists, sorted by start."""
+
+    def intervals_many(self, dates: Sequence[str]) -> Dict[str, Tuple[List[int], List[int]]]:
+        """`intervals` for several dates at once; dates without bookings may be omitted."""
+        return {d: self.intervals(d) for d in dates}
+
+    @abstractmethod
+    def bookings(self, date: str) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Every stored booking, grouped by date."""
+
+    def day_slots(self, date: str, open_min: int, close_min: int,
+                  duration: int, step: int = 15) -> List[Tuple[int, int, bool]]:
+        starts, ends = self.intervals(date)
+        return slot_grid(starts, ends, open_min, close_min, duration, step)
+
+
+class InMemoryBookingStore(BookingStore):
+    """
+    Per-process store backed by a BookingCalendar. Every access goes through
+    one lock: it makes check-and-insert atomic, and readers never see a day
+    whose starts/ends lists are halfway through an insert.
+    """
+
+    def __init__(self):
+        self._calendar = BookingCalendar()
+        self._lock = threading.Lock()
+
+    def conflicts(self, date: str, start: int, end: int) -> bool:
+        with self._lock:
+            return self._calendar.conflicts(date, start, end)
+
+    def try_book(self, booking: Dict[str, Any], start: int, end: int) -> bool:
+        with self._lock:
+            if self._calendar.conflicts(booking["date"], start, end):
+                return False
+            self._calendar.add(booking, start, end)
+            return True
+
+    def intervals(self, date: str) -> Tuple[List[int], List[int]]:
+        with self._lock:
+            starts, ends = self._calendar.intervals(date)
+            return list(starts), list(ends)
+
+    def bookings(self, date: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._calendar.bookings(date)
+
+    def __len__(self) -> int:
+        return len(self._calendar)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # snapshot, so callers can iterate while other threads keep booking
+        with self._lock:
+            return iter(list(self._calendar))
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookings (
+    booking_id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    start_min INTEGER NOT NULL,
+    end_min INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bookings_date_start ON bookings (date, start_min);
+"""
+
+
+class SQLiteBookingStore(BookingStore):
+    """
+    Durable store shared by every worker on the host. Runs in WAL mode so
+    readers never block the writer; `try_book` takes the write lock up front
+    (BEGIN IMMEDIATE) so the conflict check and insert are one transaction
+    even across processes.
+    """
+
+    def __init__(self, path: str = BOOKING_DB_PATH, pool_size: int = BOOKING_DB_POOL_SIZE):
+        self.path = path
+        dirname = os.path.dirname(os.path.abspath(path))
+        os.makedirs(dirname, exist_ok=True)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(max(1, pool_size)):
+            self._pool.put(self._connect())
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: we issue BEGIN/COMMIT ourselves
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @staticmethod
+    def _conflicts(conn: sqlite3.Connection, date: str, start: int, end: int) -> bool:
+        # bookings don't overlap, so only the latest one starting before `end` can still be running at `start`
+        row = conn.execute(
+            "SELECT end_min FROM bookings WHERE date = ? AND start_min < ? ORDER BY start_min DESC LIMIT 1",
+            (date, end),
+        ).fetchone()
+        return row is not None and row[0] > start
+
+    def conflicts(self, date: str, start: int, end: int) -> bool:
+        with self._conn() as conn:
+            return self._conflicts(conn, date, start, end)
+
+    def try_book(self, booking: Dict[str, Any], start: int, end: int) -> bool:
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conflicts(conn, booking["date"], start, end):
+                    conn.execute("ROLLBACK")
+                    return False
+                conn.execute(
+                    "INSERT INTO bookings (booking_id, date, start_min, end_min, data) VALUES (?, ?, ?, ?, ?)",
+                    (booking["booking_id"], booking["date"], start, end, json.dumps(booking)),
+                )
+                conn.execute("COMMIT")
+                return True
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def intervals(self, date: str) -> Tuple[List[int], List[int]]:
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT start_min, end_min FROM bookings WHERE date = ? ORDER BY start_min", (date,)
+            ).fetchall()
+        return [r[0] for r in rows], [r[1] for r in rows]
+
+    def intervals_many(self, dates: Sequence[str]) -> Dict[str, Tuple[List[int], List[int]]]:
+        out: Dict[str, Tuple[List[int], List[int]]] = {}
+        if not dates:
+            return out
+        marks = ",".join("?" * len(dates))
+        with self._conn() as conn:
+            rows = conn.execute(
+                f"SELECT date, start_min, end_min FROM bookings WHERE date IN ({marks}) ORDER BY date, start_min",
+                list(dates),
+            ).fetchall()
+        for date, st, ed in rows:
+            starts, ends = out.setdefault(date, ([], []))
+            starts.append(st)
+            ends.append(ed)
+        return out
+
+    def bookings(self, date: str) -> List[Dict[str, Any]]:
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT data FROM bookings WHERE date = ? ORDER BY start_min", (date,)
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def __len__(self) -> int:
+        with self._conn() as conn:
+            return conn.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._conn() as conn:
+            rows = conn.execute("SELECT data FROM bookings ORDER BY date, start_min").fetchall()
+        return (json.loads(r[0]) for r in rows)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def make_booking_store(kind: Optional[str] = None) -> BookingStore:
+    """Build the store selected by BOOKING_STORE ("memory" or "sqlite")."""
+    kind = (kind or BOOKING_STORE).lower()
+    if kind == "sqlite":
+        return SQLiteBookingStore()
+    if kind == "memory":
+        return InMemoryBookingStore()
+    raise ValueError(f"unknown BOOKING_STORE: {kind}")
@@ -0,0 +1,206 @@
+from fastapi import APIRouter
+from pydantic import BaseModel
+from datetime import date as date_cls, datetime, timedelta, time
+from typing import List, Dict, Any, Optional
+import uuid
+import os
+from api.booking_calendar import to_minutes, fmt_minutes
+from api.booking_store import make_booking_store
+from api.slot_engine import first_free_slots
+from observability import metrics
+
+router = APIRouter()
+
+# Simple in-memory schedule for demo (could be replaced with data/doctor_schedule.json)
+DOCTOR_SCHEDULE = {
+    "working_hours": {"start": "09:00", "end": "17:00"},
+    # bookings indexed by date; each is {"date":"YYYY-MM-DD","start":"HH:MM","end":"HH:MM","booking_id": "...", ...}
+    # backend picked by BOOKING_STORE (memory | sqlite), see api/booking_store.py
+    "booked": make_booking_store()
+}
+metrics.register_gauge("calendly_stored_bookings", "Bookings held by the booking store.", lambda: len(DOCTOR_SCHEDULE["booked"]))
+
+# durations (mins)
+APPOINTMENT_DURATIONS = {"consultation": 30, "followup": 15, "physical": 45, "specialist": 60}
+# longest range /availability/range will scan
+MAX_RANGE_DAYS = 62
+
+class AvailabilityQuery(BaseModel):
+    date: str
+    appointment_type: str
+
+class BookingRequest(BaseModel):
+    appointment_type: str
+    date: str
+    start_time: str
+    patient: Dict[str, Any]
+    reason: Optional[str] = None
+
+def _parse_time_str(t: str) -> time:
+    h, m = map(int, t.split(":"))
+    return time(h, m)
+
+def slot_conflicts(date: str, start: str, end: str) -> bool:
+    """
+    date: 'YYYY-MM-DD'
+    start, end: 'HH:MM'
+    returns True if any booking on same date overlaps [start, end)
+    """
+    return DOCTOR_SCHEDULE["booked"].conflicts(date, to_minutes(start), to_minutes(end))
+
+@router.get("/availability")
+def availability(date: str, appointment_type: str = "consultation"):
+    """
+    Returns a JSON structure:
+    {
+      "date": "YYYY-MM-DD",
+      "available_slots": [{"start_time":"09:00","end_time":"09:30","available":True}, ...]
+    }
+    """
+    dur = APPOINTMENT_DURATIONS.get(appointment_type, 30)
+
+    # validate date safely
+    try:
+        datetime.fromisoformat(date)
+    except Exception:
+        # return empty slots when invalid date provided
+        return {"date": date, "available_slots": []}
+
+    open_min = to_minutes(DOCTOR_SCHEDULE["working_hours"]["start"])
+    close_min = to_minutes(DOCTOR_SCHEDULE["working_hours"]["end"])
+    # slide by 15-minute granularity; one pass over the day's sorted bookings
+    grid = DOCTOR_SCHEDULE["booked"].day_slots(date, open_min, close_min, dur, step=15)
+    slots: List[Dict[str, Any]] = [
+        {"start_time": fmt_minutes(st), "end_time": fmt_minutes(edt), "available": available}
+        for st, edt, available in grid
+    ]
+    return {"date": date, "available_slots": slots}
+
+def get_availability(date: str, appointment_type: str = "consultation") -> Dict[str, Any]:
+    """
+    Helper function for other modules (scheduling agent) to call.
+    Mirrors the behavior of the /availability route.
+    """
+    with metrics.span("get_availability"):
+        return availability(date=date, appointment_type=appointment_type)
+
+@router.get("/availability/range")
+def availability_range(start_date: str, end_date: Optional[str] = None,
+                       appointment_type: str = "consultation", limit: int = 5):
+    """
+    First `limit` free slots between start_date and end_date (inclusive,
+    defaults to a week), earliest first. Returns:
+    {
+      "start_date": "YYYY-MM-DD",
+      "end_date": "YYYY-MM-DD",
+      "appointment_type": "consultation",
+      "slots": [{"date":"YYYY-MM-DD","start_time":"09:00","end_time":"09:30","available":True}, ...]
+    }
+    """
+    dur = APPOINTMENT_DURATIONS.get(appointment_type, 30)
+    empty = {"start_date": start_date, "end_date": end_date, "appointment_type": appointment_type, "slots": []}
+    try:
+        first = date_cls.fromisoformat(start_date)
+        last = date_cls.fromisoformat(end_date) if end_date else first + timedelta(days=6)
+    except Exception:
+        return empty
+    if last < first:
+        return empty
+    last = min(last, first + timedelta(days=MAX_RANGE_DAYS - 1))
+
+    dates = [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+    found = first_free_slots(
+        dates,
+        DOCTOR_SCHEDULE["booked"].intervals_many(dates),
+        to_minutes(DOCTOR_SCHEDULE["working_hours"]["start"]),
+        to_minutes(DOCTOR_SCHEDULE["working_hours"]["end"]),
+        dur,
+        step=15,
+        limit=max(0, limit),
+    )
+    return {
+        "start_date": first.isoformat(),
+        "end_date": last.isoformat(),
+        "appointment_type": appointment_type,
+        "slots": [
+            {"date": d, "start_time": fmt_minutes(st), "end_time": fmt_minutes(edt), "available": True}
+            for d, st, edt in found
+        ],
+    }
+
+def get_availability_range(start_date: str, end_date: Optional[str] = None,
+                           appointment_type: str = "consultation", limit: int = 5) -> Dict[str, Any]:
+    """
+    Helper for other modules (scheduling agent) to call.
+    Mirrors the behavior of the /availability/range route.
+    """
+    with metrics.span("get_availability_range"):
+        return availability_range(start_date=start_date, end_date=end_date,
+                                  appointment_type=appointment_type, limit=limit)
+
+@router.post("/book")
+def book(req: BookingRequest):
+    """
+    Book route that accepts BookingRequest. Computes end time, checks conflicts,
+    and adds booking to the configured booking store.
+    """
+    # compute end time based on duration
+    dur = APPOINTMENT_DURATIONS.get(req.appointment_type, 30)
+    # validate date
+    try:
+        st_date = datetime.fromisoformat(req.date).date()
+    except Exception:
+        return {"status": "failed", "reason": "invalid_date"}
+
+    # compute start and end time
+    try:
+        h, m = map(int, req.start_time.split(":"))
+    except Exception:
+        return {"status": "failed", "reason": "invalid_start_time"}
+    st_dt = datetime.combine(st_date, time(h, m))
+    ed_dt = st_dt + timedelta(minutes=dur)
+    st_str = st_dt.time().strftime("%H:%M")
+    ed_str = ed_dt.time().strftime("%H:%M")
+    # keep the interval unwrapped so a late booking doesn't break the day's ordering
+    st_min = h * 60 + m
+    ed_min = st_min + dur
+
+    booking_id = f"APPT-{uuid.uuid4().hex[:12].upper()}"
+    # conflict check and insert happen atomically inside the store
+    stored = DOCTOR_SCHEDULE["booked"].try_book({
+        "date": req.date,
+        "start": st_str,
+        "end": ed_str,
+        "booking_id": booking_id,
+        "patient": req.patient,
+        "appointment_type": req.appointment_type,
+        "reason": req.reason
+    }, st_min, ed_min)
+    if not stored:
+        return {"status": "failed", "reason": "conflict"}
+
+    return {
+        "booking_id": booking_id,
+        "status": "confirmed",
+        "confirmation_code": booking_id[-6:],
+        "details": {
+            "date": req.date,
+            "start_time": st_str,
+            "end_time": ed_str,
+            "patient": req.patient,
+            "reason": req.reason
+        }
+    }
+
+def create_booking(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Helper for other modules to create a booking. Accepts a dict similar to BookingRequest.
+    Returns the same structure as `book`.
+    """
+    with metrics.span("create_booking"):
+        # Validate and coerce into BookingRequest by building model
+        try:
+            req = BookingRequest(**payload)
+        except Exception as e:
+            return {"status": "failed", "reason": f"invalid_payload: {e}"}
+        return book(req)
@@ -0,0 +1,30 @@
+# api/chat.py 
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Optional
+from agent.scheduling_agent import SchedulingAgent
+from agent.session_store import SessionConflictError
+from observability import metrics
+
+router = APIRouter()
+agent = SchedulingAgent()
+
+metrics.register_gauge("rag_cache_entries", "FAQ answers held in the answer cache.", lambda: len(agent.rag.cache))
+metrics.register_gauge("rag_cache_hits_total", "FAQ answer cache hits.", lambda: agent.rag.cache.hits, kind="counter")
+metrics.register_gauge("rag_cache_misses_total", "FAQ answer cache misses.", lambda: agent.rag.cache.misses, kind="counter")
+
+class ChatRequest(BaseModel):
+    session_id: Optional[str] = None
+    message: str
+
+@router.post("/chat")
+async def chat(req: ChatRequest):
+    try:
+        resp = await agent.handle_message_async(req.session_id, req.message)
+        return resp
+    except SessionConflictError as e:
+        # two messages for one session raced; the client should resend
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        # avoid leaking sensitive internals but return message for debugging in dev
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,11 @@
+# api/metrics.py
+from fastapi import APIRouter, Response
+
+from observability.metrics import render
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def metrics():
+    return Response(content=render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,51 @@
+# api/slot_engine.py
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def first_free_slots(dates: Sequence[str], intervals: Dict[str, Tuple[List[int], List[int]]],
+                     open_min: int, close_min: int, duration: int,
+                     step: int = 15, limit: int = 5) -> List[Tuple[str, int, int]]:
+    """
+    Earliest `limit` free slots across `dates`, as (date, start, end) minute tuples.
+
+    Occupancy for the whole range is one (days x minutes) boolean mask built
+    from a difference array, so the cost doesn't depend on looping over slots:
+    a slot [s, s + duration) is free iff the running count of busy minutes is
+    the same at both ends. Slot starts follow the same grid as
+    slot_grid (every `step` minutes from opening, must end by close).
+    """
+    width = close_min - open_min
+    if not dates or limit <= 0 or width < duration:
+        return []
+
+    rows: List[int] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    for row, date in enumerate(dates):
+        s, e = intervals.get(date, ([], []))
+        rows.extend([row] * len(s))
+        starts.extend(s)
+        ends.extend(e)
+
+    # +1 column so bookings running to (or past) closing time have somewhere to end
+    diff = np.zeros((len(dates), width + 1), dtype=np.int32)
+    if rows:
+        r = np.asarray(rows)
+        np.add.at(diff, (r, np.clip(np.asarray(starts) - open_min, 0, width)), 1)
+        np.add.at(diff, (r, np.clip(np.asarray(ends) - open_min, 0, width)), -1)
+    busy = np.cumsum(diff[:, :width], axis=1) > 0
+
+    busy_before = np.zeros((len(dates), width + 1), dtype=np.int32)
+    np.cumsum(busy, axis=1, out=busy_before[:, 1:])
+    offsets = np.arange(0, width - duration + 1, step)
+    free = busy_before[:, offsets + duration] == busy_before[:, offsets]
+
+    # row-major order: earliest day first, then earliest time
+    day_idx, slot_idx = np.nonzero(free)
+    out: List[Tuple[str, int, int]] = []
+    for d, k in zip(day_idx[:limit].tolist(), slot_idx[:limit].tolist()):
+        st = open_min + int(offsets[k])
+        out.append((dates[d], st, st + duration))
+    return out
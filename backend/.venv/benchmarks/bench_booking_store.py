@@ -0,0 +1,128 @@
+# benchmarks/bench_booking_store.py
+"""
+Concurrent booking throughput for the booking stores.
+
+Many writers race for the same few days of 15-minute slots; afterwards every
+day is checked for overlapping bookings. Thread writers share one store
+object, process writers each open their own SQLite store on the same file
+(the multi-worker uvicorn case).
+
+Run from backend/.venv:
+    python -m benchmarks.bench_booking_store --writers 8 --attempts 2000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from typing import Tuple
+
+from api.booking_store import BookingStore, InMemoryBookingStore, SQLiteBookingStore
+
+DATES = [f"2030-01-{d:02d}" for d in range(1, 6)]
+DURATIONS = [15, 30, 45, 60]
+OPEN_MIN, CLOSE_MIN = 9 * 60, 17 * 60
+
+
+def _attempts(store: BookingStore, n: int, seed: int) -> Tuple[int, int]:
+    rnd = random.Random(seed)
+    ok = failed = 0
+    for _ in range(n):
+        dur = rnd.choice(DURATIONS)
+        start = rnd.randrange(OPEN_MIN, CLOSE_MIN - dur + 1, 15)
+        booking = {"date": rnd.choice(DATES), "booking_id": f"APPT-{uuid.uuid4().hex[:12].upper()}"}
+        if store.try_book(booking, start, start + dur):
+            ok += 1
+        else:
+            failed += 1
+    return ok, failed
+
+
+def _process_worker(path: str, n: int, seed: int, out: "multiprocessing.Queue") -> None:
+    store = SQLiteBookingStore(path, pool_size=1)
+    out.put(_attempts(store, n, seed))
+    store.close()
+
+
+def _check_no_overlaps(store: BookingStore) -> int:
+    overlaps = 0
+    for date in DATES:
+        starts, ends = store.intervals(date)
+        for i in range(1, len(starts)):
+            if starts[i] < ends[i - 1]:
+                overlaps += 1
+    return overlaps
+
+
+def run_threads(store: BookingStore, writers: int, attempts: int):
+    results = []
+    lock = threading.Lock()
+
+    def worker(seed: int):
+        r = _attempts(store, attempts, seed)
+        with lock:
+            results.append(r)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(writers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - t0
+
+
+def run_processes(path: str, writers: int, attempts: int):
+    out: "multiprocessing.Queue" = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_process_worker, args=(path, attempts, i, out)) for i in range(writers)]
+    t0 = time.perf_counter()
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return results, time.perf_counter() - t0
+
+
+def report(name: str, store: BookingStore, results, elapsed: float) -> bool:
+    ok = sum(r[0] for r in results)
+    failed = sum(r[1] for r in results)
+    overlaps = _check_no_overlaps(store)
+    total = ok + failed
+    print(f"{name:<22} attempts={total:<6} booked={ok:<5} conflicts={failed:<6} "
+          f"stored={len(store):<5} overlaps={overlaps} {total / elapsed:,.0f} attempts/s")
+    return overlaps == 0 and ok == len(store)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--writers", type=int, default=8)
+    ap.add_argument("--attempts", type=int, default=1000, help="booking attempts per writer")
+    args = ap.parse_args()
+
+    passed = True
+    mem = InMemoryBookingStore()
+    passed &= report("memory / threads", mem, *run_threads(mem, args.writers, args.attempts))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "threads.sqlite3")
+        store = SQLiteBookingStore(path, pool_size=args.writers)
+        passed &= report("sqlite / threads", store, *run_threads(store, args.writers, args.attempts))
+        store.close()
+
+        path = os.path.join(tmp, "procs.sqlite3")
+        SQLiteBookingStore(path, pool_size=1).close()  # create schema before the race
+        results, elapsed = run_processes(path, args.writers, args.attempts)
+        store = SQLiteBookingStore(path, pool_size=1)
+        passed &= report("sqlite / processes", store, results, elapsed)
+        store.close()
+
+    if not passed:
+        raise SystemExit("double booking detected")
+
+
+if __name__ == "__main__":
+    main()
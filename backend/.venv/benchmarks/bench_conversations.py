@@ -0,0 +1,340 @@
+# benchmarks/bench_conversations.py
+"""
+Conversation load test for the scheduling agent.
+
+Generates realistic multi-turn chats (greeting, booking request, appointment
+type, date preference, slot pick, patient CSV, FAQ questions) and drives them
+either in-process against SchedulingAgent.handle_message or through the
+FastAPI app over an in-memory ASGI client, at a given concurrency. Reports
+p50/p95/p99 latency per intent and per booking state, requests per second,
+and how much SESSIONS and DOCTOR_SCHEDULE grew.
+
+Runs offline: the OpenAI key is blanked so the FAQ uses the BM25 fallback.
+Bookings and sessions stay in memory whatever BOOKING_STORE/SESSION_STORE
+say, and both are reset before each mode.
+
+Run from backend/.venv:
+    python -m benchmarks.bench_conversations --mode both --conversations 500 --concurrency 16
+    python -m benchmarks.bench_conversations --save-baseline base.json
+    python -m benchmarks.bench_conversations --baseline base.json --fail-on-regression
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# offline: an empty key keeps load_dotenv from filling it in and selects the keyword fallback
+os.environ["OPENAI_API_KEY"] = ""
+os.environ.setdefault("CLINIC_INFO_PATH", os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "clinic_info.json"))
+# never write fake bookings/sessions into the real sqlite files
+os.environ["BOOKING_STORE"] = "memory"
+os.environ["SESSION_STORE"] = "memory"
+
+from agent import scheduling_agent  # noqa: E402
+from agent.scheduling_agent import SchedulingAgent, classify_intent  # noqa: E402
+from agent.session_store import InMemorySessionStore  # noqa: E402
+from api.booking_store import InMemoryBookingStore  # noqa: E402
+from api.calendly_integration import DOCTOR_SCHEDULE  # noqa: E402
+
+GREETINGS = ["hi", "hello", "hey there", "good morning"]
+BOOK = ["I want to book an appointment", "can I schedule a visit", "book appointment", "I need to see the doctor"]
+TYPES = ["consultation", "followup", "physical exam", "specialist please"]
+FAQS = ["what are your hours?", "do you take insurance", "where is the clinic located", "is there parking",
+        "what should I bring to my visit", "cancellation policy", "do you accept aetna", "what's the clinic phone"]
+NAMES = ["Jane Doe", "John Smith", "Ana Lopez", "Wei Chen", "Priya Patel", "Sam Lee"]
+
+# a turn is a fixed message, or a function of the previous response (None ends the chat)
+Turn = Any
+
+
+def _date_pref(rnd: random.Random) -> str:
+    r = rnd.random()
+    if r < 0.25:
+        return "tomorrow"
+    if r < 0.45:
+        return "this week"
+    if r < 0.6:
+        return "no preference"
+    return (datetime.date.today() + datetime.timedelta(days=rnd.randint(1, 30))).isoformat()
+
+
+def _pick_slot(rnd: random.Random) -> Callable[[Dict[str, Any]], Optional[str]]:
+    def pick(resp: Dict[str, Any]) -> Optional[str]:
+        slots = resp.get("slots") or []
+        if resp.get("type") != "suggest_slots" or not slots:
+            return None
+        s = rnd.choice(slots)
+        # same message the widget sends
+        return f"{s['date']} {s['start_time']}" if s.get("date") else s["start_time"]
+    return pick
+
+
+def _patient(rnd: random.Random) -> str:
+    name = rnd.choice(NAMES)
+    return f"{name}, +1-555-{rnd.randint(1000, 9999)}, {name.split()[0].lower()}{rnd.randint(1, 999)}@example.com"
+
+
+def make_conversation(rnd: random.Random) -> List[Turn]:
+    kind = rnd.random()
+    turns: List[Turn] = []
+    if rnd.random() < 0.6:
+        turns.append(rnd.choice(GREETINGS))
+    if kind < 0.6:
+        # full booking, sometimes with a question first
+        if rnd.random() < 0.3:
+            turns.append(rnd.choice(FAQS))
+        turns += [rnd.choice(BOOK), rnd.choice(TYPES), _date_pref(rnd), _pick_slot(rnd), _patient(rnd)]
+        if rnd.random() < 0.3:
+            turns.append(rnd.choice(FAQS))
+    elif kind < 0.85:
+        turns += [rnd.choice(FAQS) for _ in range(rnd.randint(1, 4))]
+    else:
+        # abandons at the slot list
+        turns += [rnd.choice(BOOK), rnd.choice(TYPES), _date_pref(rnd), "none", "no"]
+    return turns
+
+
+class Recorder:
+    def __init__(self):
+        self.by_intent: Dict[str, List[float]] = defaultdict(list)
+        self.by_state: Dict[str, List[float]] = defaultdict(list)
+        self.all: List[float] = []
+        self._lock = threading.Lock()
+
+    def add(self, intent: str, state: str, ms: float) -> None:
+        with self._lock:
+            self.by_intent[intent].append(ms)
+            self.by_state[state].append(ms)
+            self.all.append(ms)
+
+
+def _pct(values: List[float], p: float) -> float:
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {"n": len(values), "p50": _pct(values, 50), "p95": _pct(values, 95), "p99": _pct(values, 99)}
+
+
+# reply text -> session state it leaves the agent in; "other dates" must come before "date"
+QUESTION_STATES = (("type of appointment", "booking_needs"), ("other dates", "idle"), ("date", "asking_pref"),
+                   ("phone", "collect_info"), ("anything else", "idle"))
+
+
+def _next_state(state: str, resp: Dict[str, Any]) -> str:
+    """
+    Session state after `resp`, inferred client-side: reading it from
+    SESSIONS would refresh the session's TTL/LRU slot (and on SQLite write)
+    and change what is being measured.
+    """
+    if state == "new":
+        state = "idle"
+    kind = resp.get("type")
+    if kind == "suggest_slots":
+        return "suggesting_slots"
+    if kind in ("booking_conf", "no_slots"):
+        return "idle"
+    if kind == "question":
+        for marker, st in QUESTION_STATES:
+            if marker in resp["question"]:
+                return st
+    return state
+
+
+def run_inproc(agent: SchedulingAgent, convos: List[List[Turn]], concurrency: int, rec: Recorder) -> None:
+    def run(turns: List[Turn]) -> None:
+        sid = None
+        state = "new"
+        resp: Dict[str, Any] = {}
+        for turn in turns:
+            msg = turn(resp) if callable(turn) else turn
+            if msg is None:
+                return
+            t0 = time.perf_counter()
+            resp = agent.handle_message(sid, msg)
+            rec.add(classify_intent(msg), state, (time.perf_counter() - t0) * 1000)
+            sid = resp["session_id"]
+            state = _next_state(state, resp)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, convos))
+
+
+def run_http(convos: List[List[Turn]], concurrency: int, rec: Recorder) -> None:
+    import httpx
+    import main
+
+    async def go():
+        await asyncio.to_thread(main.chat_agent.warm_up)  # what the app lifespan does
+        sem = asyncio.Semaphore(concurrency)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def run(turns: List[Turn]) -> None:
+                async with sem:
+                    sid = None
+                    state = "new"
+                    resp: Dict[str, Any] = {}
+                    for turn in turns:
+                        msg = turn(resp) if callable(turn) else turn
+                        if msg is None:
+                            return
+                        t0 = time.perf_counter()
+                        r = await client.post("/api/chat", json={"session_id": sid, "message": msg})
+                        rec.add(classify_intent(msg), state, (time.perf_counter() - t0) * 1000)
+                        resp = r.json()
+                        sid = resp["session_id"]
+                        state = _next_state(state, resp)
+
+            await asyncio.gather(*(run(t) for t in convos))
+
+    asyncio.run(go())
+
+
+_LOCK_TYPE = type(threading.Lock())
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate retained size of an object graph (dicts, sequences, __dict__/__slots__ objects)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, (type, _LOCK_TYPE)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(x, seen) for x in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+def _store_stats() -> Dict[str, int]:
+    return {
+        "sessions": len(scheduling_agent.SESSIONS),
+        "sessions_bytes": deep_sizeof(scheduling_agent.SESSIONS),
+        "bookings": len(DOCTOR_SCHEDULE["booked"]),
+        "bookings_bytes": deep_sizeof(DOCTOR_SCHEDULE["booked"]),
+    }
+
+
+def bench(mode: str, agent: SchedulingAgent, args) -> Dict[str, Any]:
+    rnd = random.Random(args.seed)
+    convos = [make_conversation(rnd) for _ in range(args.conversations)]
+    rec = Recorder()
+    # start each mode from empty stores, so inproc and http see the same calendar
+    DOCTOR_SCHEDULE["booked"] = InMemoryBookingStore()
+    scheduling_agent.SESSIONS = InMemorySessionStore()
+    before = _store_stats()
+    if args.trace_heap:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    if mode == "inproc":
+        run_inproc(agent, convos, args.concurrency, rec)
+    else:
+        run_http(convos, args.concurrency, rec)
+    elapsed = time.perf_counter() - t0
+    heap = None
+    if args.trace_heap:
+        heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    after = _store_stats()
+    return {
+        "requests": len(rec.all),
+        "rps": len(rec.all) / elapsed,
+        "overall": _summary(rec.all),
+        "by_intent": {k: _summary(v) for k, v in sorted(rec.by_intent.items())},
+        "by_state": {k: _summary(v) for k, v in sorted(rec.by_state.items())},
+        "growth": {k: after[k] - before[k] for k in after},
+        "heap_retained_bytes": heap,
+    }
+
+
+def print_report(mode: str, r: Dict[str, Any], base: Optional[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Print one mode's results; returns regressions vs `base` larger than `tolerance` (0.2 = 20%)."""
+    regressions: List[str] = []
+
+    def row(label: str, s: Dict[str, float], b: Optional[Dict[str, float]]) -> None:
+        cols = f"{label:<22} n={s['n']:<6} p50={s['p50']:7.3f}  p95={s['p95']:7.3f}  p99={s['p99']:7.3f} ms"
+        if b:
+            deltas = []
+            for p in ("p50", "p95", "p99"):
+                change = (s[p] - b[p]) / b[p] if b[p] else 0.0
+                deltas.append(f"{p} {change:+.0%}")
+                if change > tolerance and s[p] - b[p] > 0.05:
+                    regressions.append(f"{mode} {label} {p} {b[p]:.3f} -> {s[p]:.3f} ms")
+            cols += "   vs baseline: " + ", ".join(deltas)
+        print(cols)
+
+    print(f"\n== {mode}: {r['requests']} requests, {r['rps']:,.0f} req/s"
+          + (f" (baseline {base['rps']:,.0f})" if base else ""))
+    if base and r["rps"] < base["rps"] * (1 - tolerance):
+        regressions.append(f"{mode} throughput {base['rps']:,.0f} -> {r['rps']:,.0f} req/s")
+    row("overall", r["overall"], base and base["overall"])
+    print("-- by intent")
+    for k, s in r["by_intent"].items():
+        row(k, s, base and base["by_intent"].get(k))
+    print("-- by booking state")
+    for k, s in r["by_state"].items():
+        row(k, s, base and base["by_state"].get(k))
+    g = r["growth"]
+    heap = r["heap_retained_bytes"]
+    print(f"-- growth: sessions +{g['sessions']} ({g['sessions_bytes'] / 1024:,.0f} KiB), "
+          f"bookings +{g['bookings']} ({g['bookings_bytes'] / 1024:,.0f} KiB)"
+          + (f", heap retained {heap / 1024:,.0f} KiB" if heap is not None else ""))
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--mode", choices=["inproc", "http", "both"], default="both")
+    ap.add_argument("--conversations", type=int, default=300)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--baseline", help="JSON report from an earlier --save-baseline run to compare against")
+    ap.add_argument("--save-baseline", help="write this run's results to a JSON file")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    ap.add_argument("--trace-heap", action="store_true",
+                    help="also report heap retained during the run (tracemalloc; slows every request)")
+    args = ap.parse_args()
+
+    base = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            base = json.load(f)
+
+    agent = SchedulingAgent()
+    agent.warm_up()
+    modes = ["inproc", "http"] if args.mode == "both" else [args.mode]
+    results: Dict[str, Any] = {}
+    regressions: List[str] = []
+    for mode in modes:
+        results[mode] = bench(mode, agent, args)
+        regressions += print_report(mode, results[mode], base.get(mode), args.tolerance)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nsaved baseline to {args.save_baseline}")
+    if regressions:
+        print("\nregressions:\n  " + "\n  ".join(regressions))
+        if args.fail_on_regression:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_faq_retrieval.py
+"""
+Keyword retrieval: BM25 index vs the old substring hit-count scorer.
+
+The corpus is clinic_info.json plus synthetic policy entries, each about one
+made-up topic word buried in shared filler text. Every query has exactly one
+relevant entry; ranking quality is precision@1 and MRR over top 5.
+
+Run from backend/.venv:
+    python -m benchmarks.bench_faq_retrieval --sizes 100 1000 5000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+from rag.bm25 import BM25Index
+
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "clinic_info.json")
+
+FILLER = ("patients appointment clinic visit staff doctor please call office in a on at the "
+          "for with notice required before after weekday weekend form records").split()
+
+# hand-labelled questions against the real FAQ entries (index into clinic_info.json)
+FAQ_QUERIES = [
+    ("what are your hours", 0),
+    ("where is the clinic located", 0),
+    ("is there parking", 0),
+    ("do you take aetna", 1),
+    ("insurance", 1),
+    ("can I pay with cash", 1),
+    ("what should I bring to my visit", 2),
+    ("cancellation policy", 3),
+    ("what if I arrive late", 3),
+    ("do I need a mask", 3),
+]
+
+
+def legacy_query(texts: List[str], q: str, top_k: int) -> List[int]:
+    """The scorer FAQRAG.query used before the BM25 index (returns doc indices)."""
+    q_lower = q.lower()
+    scored = []
+    for i, txt in enumerate(texts):
+        score = 0
+        tl = txt.lower()
+        for token in q_lower.split():
+            if token and token in tl:
+                score += 1
+        if q_lower in tl:
+            score += 2
+        if score > 0:
+            scored.append((score, i))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [i for _, i in scored[:top_k]]
+
+
+def build_corpus(size: int, rnd: random.Random) -> Tuple[List[str], List[str], List[Tuple[str, int]]]:
+    with open(SOURCE) as f:
+        base = json.load(f)
+    titles = [e["title"] for e in base]
+    texts = [f"{e['title']}\n\n{e['text']}" for e in base]
+    queries = list(FAQ_QUERIES)
+    for i in range(max(0, size - len(base))):
+        topic = f"topic{i}x"
+        title = f"Policy {i}"
+        body = " ".join(rnd.choice(FILLER) for _ in range(rnd.randint(15, 40)))
+        texts.append(f"{title}\n\n{body} {topic} {body[:40]}")
+        titles.append(title)
+        queries.append((f"what is the policy on {topic} in the clinic", len(texts) - 1))
+    return texts, titles, queries
+
+
+def evaluate(name: str, search, queries, repeat: int) -> None:
+    hits = 0
+    rr = 0.0
+    for q, relevant in queries:
+        ranked = search(q)
+        if ranked and ranked[0] == relevant:
+            hits += 1
+        if relevant in ranked:
+            rr += 1 / (ranked.index(relevant) + 1)
+    timings = []
+    sample = queries[:repeat]
+    for q, _ in sample:
+        t0 = time.perf_counter()
+        search(q)
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"  {name:<8} P@1={hits / len(queries):.3f}  MRR@5={rr / len(queries):.3f}  "
+          f"p50={statistics.median(timings):.3f} ms  p99={p99:.3f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    ap.add_argument("--queries", type=int, default=200, help="queries timed per engine and size")
+    args = ap.parse_args()
+
+    for size in args.sizes:
+        rnd = random.Random(size)
+        texts, titles, queries = build_corpus(size, rnd)
+        rnd.shuffle(queries)
+        t0 = time.perf_counter()
+        index = BM25Index(texts, titles=titles)
+        build_ms = (time.perf_counter() - t0) * 1000
+        print(f"corpus={len(texts)} docs (BM25 build {build_ms:.1f} ms)")
+        evaluate("legacy", lambda q: legacy_query(texts, q, 5), queries, args.queries)
+        evaluate("bm25", lambda q: [d for _, d in index.search(q, 5)], queries, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_metrics_overhead.py
+"""
+Cost of the latency instrumentation (observability/metrics.py).
+
+Replays the same generated conversations in-process with metrics disabled and
+enabled (alternating rounds, fresh booking and session stores each round) and
+reports the mean handle_message time for each, plus the raw cost of one span().
+
+Run from backend/.venv:
+    python -m benchmarks.bench_metrics_overhead --conversations 300 --rounds 5
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.bench_conversations import Recorder, make_conversation, run_inproc
+from agent import scheduling_agent
+from agent.scheduling_agent import SchedulingAgent
+from agent.session_store import InMemorySessionStore
+from observability import metrics
+from api.booking_store import InMemoryBookingStore
+from api.calendly_integration import DOCTOR_SCHEDULE
+
+
+class _Bare:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+def span_cost_ns(n: int = 200_000) -> float:
+    """Per-span cost on top of an empty `with` block (the uninstrumented baseline)."""
+    bare = _Bare()
+    t0 = time.perf_counter_ns()
+    for _ in range(n):
+        with bare:
+            pass
+    base = time.perf_counter_ns() - t0
+    t0 = time.perf_counter_ns()
+    for _ in range(n):
+        with metrics.span("bench"):
+            pass
+    return (time.perf_counter_ns() - t0 - base) / n
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--conversations", type=int, default=300)
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    agent = SchedulingAgent()
+    agent.warm_up()
+    rnd = random.Random(args.seed)
+    convos = [make_conversation(rnd) for _ in range(args.conversations)]
+
+    means = {False: [], True: []}
+    for _ in range(args.rounds):
+        for enabled in (False, True):
+            metrics.set_enabled(enabled)
+            DOCTOR_SCHEDULE["booked"] = InMemoryBookingStore()
+            scheduling_agent.SESSIONS = InMemorySessionStore()
+            rec = Recorder()
+            # one worker: measure instrumentation, not GIL contention
+            run_inproc(agent, convos, 1, rec)
+            means[enabled].append(statistics.mean(rec.all) * 1000)
+
+    metrics.set_enabled(False)
+    off_span = span_cost_ns()
+    metrics.set_enabled(True)
+    on_span = span_cost_ns()
+
+    off = statistics.median(means[False])
+    on = statistics.median(means[True])
+    print(f"handle_message mean: disabled {off:.1f} us, enabled {on:.1f} us ({(on - off) / off:+.1%})")
+    print(f"one span() over a bare with-block: disabled {off_span:.0f} ns, enabled {on_span:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
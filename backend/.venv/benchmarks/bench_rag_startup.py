@@ -0,0 +1,93 @@
+# benchmarks/bench_rag_startup.py
+"""
+Cold vs warm start of the FAQ vector index.
+
+Cold: empty persist directory, every FAQ entry is embedded.
+Warm: a new FAQRAG on the same directory, nothing should be re-embedded.
+Edit: one entry changed, only that entry should be re-embedded.
+
+Uses OpenAIEmbeddings when OPENAI_API_KEY is set, otherwise a deterministic
+fake embedding with simulated per-call latency so it runs offline.
+
+Run from backend/.venv:
+    python -m benchmarks.bench_rag_startup --embed-latency-ms 150
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+TMP = tempfile.mkdtemp(prefix="rag-bench-")
+os.environ["VECTOR_DB_PERSIST_DIR"] = os.path.join(TMP, "vectordb")
+os.environ["CLINIC_INFO_PATH"] = os.path.join(TMP, "clinic_info.json")
+
+from rag import faq_rag  # noqa: E402  (env above must be set first)
+from rag.faq_rag import FAQRAG  # noqa: E402
+
+SOURCE = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "clinic_info.json")
+
+
+class CountingEmbeddings:
+    """Wraps an embedding function, counting embedded texts and adding fake network latency."""
+
+    def __init__(self, inner, latency_s: float):
+        self.inner = inner
+        self.latency_s = latency_s
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency_s)
+        self.embedded += len(texts)
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        time.sleep(self.latency_s)
+        return self.inner.embed_query(text)
+
+
+def _embeddings(latency_s: float) -> CountingEmbeddings:
+    if faq_rag.OPENAI_API_KEY:
+        from langchain_openai import OpenAIEmbeddings
+        return CountingEmbeddings(OpenAIEmbeddings(), 0.0)
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    return CountingEmbeddings(DeterministicFakeEmbedding(size=256), latency_s)
+
+
+def _start(name: str, latency_s: float) -> None:
+    emb = _embeddings(latency_s)
+    t0 = time.perf_counter()
+    rag = FAQRAG(lazy=False, embeddings=emb)
+    elapsed = time.perf_counter() - t0
+    print(f"{name:<6} {elapsed * 1000:8.1f} ms  embedded={emb.embedded:<4} {rag.sync_stats}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--embed-latency-ms", type=float, default=150.0,
+                    help="simulated latency per embedding call when running offline")
+    ap.add_argument("--copies", type=int, default=25,
+                    help="replicate the FAQ entries to mimic a larger knowledge base")
+    args = ap.parse_args()
+    latency_s = args.embed_latency_ms / 1000
+
+    with open(SOURCE) as f:
+        base = json.load(f)
+    entries = [{"title": f"{e['title']} #{i}", "text": e["text"]} for i in range(args.copies) for e in base]
+    try:
+        with open(faq_rag.DATA_PATH, "w") as f:
+            json.dump(entries, f)
+        _start("cold", latency_s)
+        _start("warm", latency_s)
+
+        entries[0]["text"] += " Updated."
+        with open(faq_rag.DATA_PATH, "w") as f:
+            json.dump(entries, f)
+        _start("edit", latency_s)
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from api.chat import router as chat_router, agent as chat_agent
+from api.calendly_integration import router as calendly_router
+from api.metrics import router as metrics_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # build the FAQ index and precompute canned answers before taking traffic
+    await run_in_threadpool(chat_agent.warm_up)
+    yield
+
+app = FastAPI(title="Appointment Scheduling Agent", lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(chat_router, prefix="/api")
+# Calendly endpoints live under /api/calendly/*
+app.include_router(calendly_router, prefix="/api/calendly")
+# Prometheus scrape endpoint at /metrics
+app.include_router(metrics_router)
+
+@app.get("/")
+def index():
+    return {"status": "ok", "service": "appointment-scheduling-agent"}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("main:app", host="0.0.0.0", port=int(os.getenv("BACKEND_PORT", 8000)), reload=True)
@@ -0,0 +1,216 @@
+# observability/metrics.py
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# METRICS_ENABLED=0 turns every span/observe into a no-op
+ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+# requests slower than this (ms) get their sampled stacks printed; 0 disables the profiler
+SLOW_REQUEST_PROFILE_MS = float(os.getenv("SLOW_REQUEST_PROFILE_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def set_enabled(enabled: bool) -> None:
+    global ENABLED
+    ENABLED = enabled
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """Prometheus-style histogram; per label set, counts are kept per bucket and made cumulative on render."""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [per-bucket counts (+Inf last), sum, count]
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v[0]), v[1], v[2]) for k, v in sorted(self._series.items())]
+        for labels, counts, total, count in items:
+            cum = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cum += c
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                le_label = 'le="' + le + '"'
+                out.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le_label)} {cum}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return out
+
+
+STAGE_SECONDS = Histogram("chat_stage_seconds", "Time spent in one stage of handling a chat message.", ("stage",))
+REQUEST_SECONDS = Histogram("chat_request_seconds", "End-to-end SchedulingAgent message handling time.", ("intent", "state"))
+
+# name -> (help, type, callback); evaluated at scrape time
+_GAUGES: Dict[str, Tuple[str, str, Callable[[], float]]] = {}
+
+
+def register_gauge(name: str, help: str, fn: Callable[[], float], kind: str = "gauge") -> None:
+    """Expose fn() in `render()` (served on /metrics). kind="counter" for monotonically increasing values."""
+    _GAUGES[name] = (help, kind, fn)
+
+
+def now() -> float:
+    """Start time for `observe_request`; 0.0 when metrics are off."""
+    return time.perf_counter() if ENABLED else 0.0
+
+
+def observe_request(start: float, intent: str, state: str) -> None:
+    if ENABLED and start:
+        REQUEST_SECONDS.observe(time.perf_counter() - start, (intent, state))
+
+
+class _Span:
+    # a plain class is several times cheaper to enter/exit than a @contextmanager generator
+    __slots__ = ("stage", "t0")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        STAGE_SECONDS.observe(time.perf_counter() - self.t0, (self.stage,))
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NOOP = _Noop()
+
+
+def span(stage: str):
+    """Time a block into chat_stage_seconds{stage=...}."""
+    return _Span(stage) if ENABLED else _NOOP
+
+
+class SlowRequestProfiler:
+    """
+    Sampling profiler for slow requests. While a block is being watched, one
+    background thread samples the stack of the thread that entered `watch()`
+    every PROFILE_INTERVAL_MS; if the block then took longer than the
+    threshold, the most frequent stacks are printed. Only that thread is
+    sampled, so watch blocking work where it runs: the sync chat path is
+    watched whole, the async path watches its conversation step in the
+    worker thread and the FAQ search in the search pool thread (see
+    FAQRAG._db_query). Watching the event loop would only show it idle.
+    """
+
+    def __init__(self, threshold_ms: float, interval_ms: float = PROFILE_INTERVAL_MS, top: int = 5):
+        self.threshold_s = threshold_ms / 1000
+        self.interval_s = interval_ms / 1000
+        self.top = top
+        self._active: Dict[int, Tuple[int, Counter]] = {}  # watch id -> (thread id, stack counts)
+        self._lock = threading.Lock()
+        # the sampler sleeps on this while nothing is being watched
+        self._watching = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._next_id = 0
+
+    def _sample_loop(self) -> None:
+        while True:
+            with self._watching:
+                while not self._active:
+                    self._watching.wait()
+            time.sleep(self.interval_s)
+            with self._lock:
+                watched = list(self._active.values())
+            frames = sys._current_frames()
+            for thread_id, stacks in watched:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stack = tuple(f"{fs.filename}:{fs.lineno} {fs.name}" for fs in traceback.extract_stack(frame)[-12:])
+                    stacks[stack] += 1
+
+    @contextmanager
+    def watch(self, label: str) -> Iterator[None]:
+        stacks: Counter = Counter()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="slow-request-profiler", daemon=True)
+                self._thread.start()
+            watch_id = self._next_id
+            self._next_id += 1
+            self._active[watch_id] = (threading.get_ident(), stacks)
+            self._watching.notify()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                del self._active[watch_id]
+            if elapsed >= self.threshold_s:
+                self._report(label, elapsed, stacks)
+
+    def _report(self, label: str, elapsed: float, stacks: Counter) -> None:
+        total = sum(stacks.values())
+        lines = [f"slow request ({label}): {elapsed * 1000:.1f} ms, {total} samples"]
+        for stack, n in stacks.most_common(self.top):
+            lines.append(f"  {n}/{total} samples:")
+            lines.extend(f"    {fr}" for fr in stack)
+        print("\n".join(lines))
+
+
+PROFILER = SlowRequestProfiler(SLOW_REQUEST_PROFILE_MS) if SLOW_REQUEST_PROFILE_MS > 0 else None
+
+
+def profile_if_slow(label: str):
+    """Wrap a request so its sampled stacks are printed if it ends up slow (no-op unless enabled)."""
+    return PROFILER.watch(label) if PROFILER is not None else _NOOP
+
+
+def render() -> str:
+    lines: List[str] = []
+    for name, (help, kind, fn) in sorted(_GAUGES.items()):
+        try:
+            value = fn()
+        except Exception:
+            continue
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    lines += STAGE_SECONDS.render()
+    lines += REQUEST_SECONDS.render()
+    return "\n".join(lines) + "\n"
+
@@ -0,0 +1,82 @@
+# rag/answer_cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+RAG_CACHE_SIZE = int(os.getenv("RAG_CACHE_SIZE", "1024"))
+RAG_CACHE_TTL_SECONDS = float(os.getenv("RAG_CACHE_TTL_SECONDS", "600"))
+
+
+def normalize_query(q: str) -> str:
+    """Case, whitespace and trailing punctuation don't change the answer."""
+    return " ".join(q.lower().split()).strip(" ?!.")
+
+
+def file_fingerprint(paths: Iterable[str]) -> Tuple:
+    """(mtime_ns, size) per path, None for missing files; changes whenever a file is rewritten."""
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            out.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+class AnswerCache:
+    """
+    LRU with a TTL for FAQ answers, plus pinned entries (precomputed canned
+    answers) that are never evicted by size or age, only by `clear()`.
+    `put` can give an entry a shorter TTL than the default.
+    """
+
+    def __init__(self, max_size: int = RAG_CACHE_SIZE, ttl: float = RAG_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires_at, answer)
+        self._data: "OrderedDict[Hashable, Tuple[float, str]]" = OrderedDict()
+        self._pinned: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            if key in self._pinned:
+                self.hits += 1
+                return self._pinned[key]
+            item = self._data.get(key)
+            if item is not None and time.monotonic() <= item[0]:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: str, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pin(self, key: Hashable, value: str) -> None:
+        with self._lock:
+            self._pinned[key] = value
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._pinned.clear()
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._pinned)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "pinned": len(self._pinned)}
@@ -0,0 +1,98 @@
+# rag/bm25.py
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# words that carry no signal in clinic FAQ questions
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from have how i if in is it me my
+of on or our please the to we what when where which who will with you your
+""".split())
+
+
+def _stem(tok: str) -> str:
+    """Crude plural folding so 'hour' matches 'hours' and 'policy' matches 'policies'."""
+    if len(tok) > 4 and tok.endswith("ies"):
+        return tok[:-3] + "y"
+    if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+        return tok[:-1]
+    return tok
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; a plural also emits its stem, so exact forms outrank folded ones."""
+    out: List[str] = []
+    for t in TOKEN_RE.findall(text.lower()):
+        if t in STOPWORDS:
+            continue
+        out.append(t)
+        stem = _stem(t)
+        if stem != t:
+            out.append(stem)
+    return out
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed list of texts. Built once: each term's posting list
+    is a pair of arrays (doc ids, the documents' full BM25 weight for that term),
+    so a query is a few vectorized adds and a heap pick of the top k.
+    """
+
+    def __init__(self, texts: List[str], titles: Optional[List[str]] = None,
+                 k1: float = 1.5, b: float = 0.75):
+        """titles: optional per-text titles whose terms are counted once more than body terms."""
+        self.texts = texts
+        docs = [Counter(tokenize(t)) for t in texts]
+        if titles:
+            for c, title in zip(docs, titles):
+                c.update(tokenize(title))
+        lengths = [sum(c.values()) for c in docs]
+        n = len(docs)
+        avgdl = (sum(lengths) / n) if n else 0.0
+
+        df: Dict[str, int] = defaultdict(int)
+        for c in docs:
+            for term in c:
+                df[term] += 1
+
+        lists: Dict[str, Tuple[List[int], List[float]]] = {}
+        for doc_id, c in enumerate(docs):
+            norm = k1 * (1 - b + b * lengths[doc_id] / avgdl) if avgdl else k1
+            for term, tf in c.items():
+                idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                ids, weights = lists.setdefault(term, ([], []))
+                ids.append(doc_id)
+                weights.append(idf * tf * (k1 + 1) / (tf + norm))
+        self.n_docs = n
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            term: (np.array(ids, dtype=np.int32), np.array(weights))
+            for term, (ids, weights) in lists.items()
+        }
+
+    def search(self, query: str, top_k: int = 2) -> List[Tuple[float, int]]:
+        """Top `top_k` (score, doc_id) pairs with a positive score, best first."""
+        terms = [t for t in set(tokenize(query)) if t in self.postings]
+        if not terms or top_k <= 0:
+            return []
+        scores = np.zeros(self.n_docs)
+        for term in terms:
+            ids, weights = self.postings[term]
+            scores[ids] += weights  # ids are unique within a posting list
+        cand = np.flatnonzero(scores)
+        if len(cand) > top_k:
+            # keep everything tied with the k-th score so the heap can break ties exactly
+            kth = np.partition(scores[cand], len(cand) - top_k)[len(cand) - top_k]
+            cand = cand[scores[cand] >= kth]
+        # ties go to the earlier document, like the stable sort this replaced
+        best = heapq.nsmallest(top_k, zip((-scores[cand]).tolist(), cand.tolist()))
+        return [(-neg, d) for neg, d in best]
+
+    def query(self, query: str, top_k: int = 2) -> List[str]:
+        return [self.texts[d] for _, d in self.search(query, top_k)]
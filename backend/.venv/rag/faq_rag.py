@@ -0,0 +1,310 @@
+# backend/.venv/rag/faq_rag.py
+import os
+import json
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# Use the langchain-chroma wrapper and OpenAI embeddings when available.
+from langchain_chroma import Chroma
+
+from rag.answer_cache import AnswerCache, file_fingerprint, normalize_query
+from rag.bm25 import BM25Index
+from observability import metrics
+
+# if langchain-core Document import path differs, use a safe fallback to simple strings
+try:
+    from langchain_core.documents import Document
+except Exception:
+    # Create a tiny Document shim with same attributes for compatibility
+    class Document:
+        def __init__(self, page_content: str, metadata: dict = None):
+            self.page_content = page_content
+            self.metadata = metadata or {}
+
+DATA_PATH = os.getenv("CLINIC_INFO_PATH", os.path.join(os.path.dirname(__file__), "..", "..", "data", "clinic_info.json"))
+PERSIST_DIR = os.getenv("VECTOR_DB_PERSIST_DIR", "./data/vectordb")
+# same name Chroma.from_documents used, so the first sync also cleans up the old duplicate vectors
+COLLECTION_NAME = os.getenv("VECTOR_DB_COLLECTION", "langchain")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", None)
+# how often (seconds) query() stats clinic_info.json / the vector store for changes
+RAG_CACHE_CHECK_INTERVAL = float(os.getenv("RAG_CACHE_CHECK_INTERVAL", "1.0"))
+# seconds aquery() waits for a vector search before answering from the keyword index
+RAG_QUERY_TIMEOUT = float(os.getenv("RAG_QUERY_TIMEOUT", "5"))
+# max embedding/vector searches in flight per process; aquery() answers from the keyword index past that
+RAG_EMBED_CONCURRENCY = int(os.getenv("RAG_EMBED_CONCURRENCY", "4"))
+# how long a keyword answer served in place of a slow or skipped vector search stays cached
+RAG_FALLBACK_TTL_SECONDS = float(os.getenv("RAG_FALLBACK_TTL_SECONDS", "30"))
+NO_ANSWER = "Sorry — I couldn't find an answer in the FAQ."
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _load_documents() -> List[Document]:
+    try:
+        with open(DATA_PATH, "r") as f:
+            docs_json = json.load(f)
+    except Exception:
+        docs_json = []
+
+    documents = []
+    for item in docs_json:
+        title = item.get("title", "")
+        body = item.get("text", "")
+        text = f"{title}\n\n{body}".strip()
+        # the content hash doubles as the vector id, so unchanged entries are never re-embedded
+        documents.append(Document(page_content=text, metadata={"title": title, "content_hash": content_hash(text)}))
+    return documents
+
+class FAQRAG:
+    def __init__(self, lazy: bool = True, embeddings=None):
+        """
+        lazy: defer embedding/index sync to the first query instead of construction time.
+        embeddings: embedding function to use; defaults to OpenAIEmbeddings when OPENAI_API_KEY is set.
+        """
+        self.db = None
+        self._embeddings = embeddings
+        self.use_db = embeddings is not None or bool(OPENAI_API_KEY)
+        self.sync_stats = {"added": 0, "deleted": 0, "kept": 0}
+        self._built = False
+        self._build_lock = threading.Lock()
+        # serializes refresh_if_changed, so one caller invalidates and re-pins per change
+        self._refresh_lock = threading.Lock()
+        # held for the whole outbound call, so searches abandoned by a timed-out request still count
+        self._embed_slots = threading.BoundedSemaphore(RAG_EMBED_CONCURRENCY)
+        # aquery's searches get their own threads, one per slot, so slow or abandoned
+        # embedding calls never tie up the default executor the chat steps run on
+        self._search_pool = ThreadPoolExecutor(max_workers=RAG_EMBED_CONCURRENCY, thread_name_prefix="faq-search")
+        self.cache = AnswerCache()
+        # canned query -> top_k, recomputed whenever the cache is invalidated
+        self._precomputed: Dict[str, int] = {}
+        # bumped on every invalidation so a stale background re-pin doesn't pin old answers
+        self._generation = 0
+        self._load()
+        if not lazy:
+            self.build()
+
+    def _load(self):
+        self.documents = _load_documents()
+        # Precompute plain texts and the BM25 index for the keyword fallback
+        self.plain_texts = [d.page_content for d in self.documents]
+        self.keyword_index = BM25Index(self.plain_texts, titles=[d.metadata["title"] for d in self.documents])
+        self._data_fp = file_fingerprint([DATA_PATH])
+        self._index_fp = file_fingerprint(self._index_files())
+        self._next_check = time.monotonic() + RAG_CACHE_CHECK_INTERVAL
+
+    def _index_files(self) -> List[str]:
+        return [os.path.join(PERSIST_DIR, "chroma.sqlite3")] if self.use_db else []
+
+    def _refresh_due(self) -> bool:
+        return time.monotonic() >= self._next_check
+
+    def refresh_if_changed(self, force: bool = False) -> bool:
+        """
+        Drop cached answers when clinic_info.json or the vector store changed on disk.
+        A changed data file is also reloaded and the vector index re-synced on next use.
+        The canned answers are re-pinned in a background thread.
+        Returns True if anything was invalidated.
+        """
+        if not force and not self._refresh_due():
+            return False
+        with self._refresh_lock:
+            # another caller may have done the check while we waited
+            now = time.monotonic()
+            if not force and now < self._next_check:
+                return False
+            self._next_check = now + RAG_CACHE_CHECK_INTERVAL
+            data_changed = file_fingerprint([DATA_PATH]) != self._data_fp
+            index_fp = file_fingerprint(self._index_files())
+            if not (data_changed or index_fp != self._index_fp):
+                return False
+            self._index_fp = index_fp
+            if data_changed:
+                with self._build_lock:
+                    self._load()
+                    self._built = False
+            self.cache.clear()
+            self._generation += 1
+            if self._precomputed:
+                # the re-sync and re-embedding can take seconds; don't hold up the caller
+                threading.Thread(target=self._repin, args=(self._generation,), name="faq-repin", daemon=True).start()
+            return True
+
+    def precompute(self, queries: Dict[str, int]):
+        """Answer fixed queries ({query: top_k}) up front and pin them in the cache."""
+        for q, top_k in queries.items():
+            self._precomputed[q] = top_k
+            self.cache.pin((normalize_query(q), top_k), self._query_uncached(q, top_k))
+
+    def _repin(self, generation: int):
+        for q, top_k in list(self._precomputed.items()):
+            ans = self._query_uncached(q, top_k)
+            if generation != self._generation:
+                return
+            self.cache.pin((normalize_query(q), top_k), ans)
+
+    def build(self):
+        """Open the persisted collection and bring it in line with clinic_info.json (idempotent)."""
+        if self._built:
+            return
+        with self._build_lock:
+            if self._built:
+                return
+            if self.use_db:
+                try:
+                    emb = self._embeddings
+                    if emb is None:
+                        from langchain_openai import OpenAIEmbeddings
+                        emb = OpenAIEmbeddings()
+                    self.db = self._sync_index(emb)
+                    # the sync writes chroma.sqlite3; that's our own change, not an outside one
+                    self._index_fp = file_fingerprint(self._index_files())
+                except Exception as e:
+                    # If embeddings fail, fallback to local simple search
+                    print("OpenAI embeddings failed or not configured correctly:", e)
+                    self.db = None
+                    self.use_db = False
+            self._built = True
+
+    def _sync_index(self, emb) -> Chroma:
+        """
+        Reuse the persisted collection: embed only documents whose content hash
+        isn't stored yet and delete vectors whose entry was edited or removed.
+        """
+        db = Chroma(collection_name=COLLECTION_NAME, embedding_function=emb, persist_directory=PERSIST_DIR)
+        wanted = {d.metadata["content_hash"]: d for d in self.documents}
+        existing = set(db.get(include=[])["ids"])
+        stale = [i for i in existing if i not in wanted]
+        new = [h for h in wanted if h not in existing]
+        if stale:
+            db.delete(ids=stale)
+        if new:
+            db.add_documents([wanted[h] for h in new], ids=new)
+        self.sync_stats = {"added": len(new), "deleted": len(stale), "kept": len(wanted) - len(new)}
+        return db
+
+    def query(self, q: str, top_k: int = 2) -> str:
+        """
+        Cached answer for (normalized q, top_k); see `_query_uncached` on a miss.
+        """
+        self.refresh_if_changed()
+        key = (normalize_query(q), top_k)
+        ans = self.cache.get(key)
+        if ans is None:
+            generation = self._generation
+            ans = self._query_uncached(q, top_k)
+            # the data changed mid-search: answer this caller, but don't cache the old answer
+            if generation == self._generation:
+                self.cache.put(key, ans)
+        return ans
+
+    async def aquery(self, q: str, top_k: int = 2, timeout: float = RAG_QUERY_TIMEOUT) -> str:
+        """
+        Async `query`. The index build and vector search run on a dedicated
+        thread pool and are given `timeout` seconds together; past that the
+        keyword answer is returned and the search is left to finish and fill
+        the cache for the next asker. When RAG_EMBED_CONCURRENCY searches are
+        already in flight no new one is started: the keyword answer is
+        returned right away and cached for RAG_FALLBACK_TTL_SECONDS.
+        Cache hits and the keyword path never leave the event loop.
+        """
+        if self._refresh_due():
+            # stats the files and, after a change, reloads clinic_info.json
+            await asyncio.to_thread(self.refresh_if_changed)
+        key = (normalize_query(q), top_k)
+        ans = self.cache.get(key)
+        if ans is not None:
+            return ans
+        if not self.use_db:
+            ans = self._keyword_query(q, top_k)
+            self.cache.put(key, ans)
+            return ans
+        # take the slot here, not in the worker, so a saturated pool never queues more threads
+        if not self._embed_slots.acquire(blocking=False):
+            return self._fallback(key, q, top_k)
+        generation = self._generation
+        task = asyncio.get_running_loop().run_in_executor(self._search_pool, self._db_query, q, top_k)
+        task.add_done_callback(lambda t: self._search_done(key, generation, t))
+        try:
+            # shield: a timeout or a cancelled request stops the wait, not the thread
+            ans = await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            print("RAG DB query timed out, using keyword fallback:", q)
+            return self._fallback(key, q, top_k)
+        if ans is not None:
+            return ans
+        if self.use_db:
+            # the DB call failed; try it again soon
+            return self._fallback(key, q, top_k)
+        ans = self._keyword_query(q, top_k)
+        self.cache.put(key, ans)
+        return ans
+
+    def _fallback(self, key, q: str, top_k: int) -> str:
+        """Keyword answer standing in for a vector one; cached briefly so retries don't each search."""
+        ans = self._keyword_query(q, top_k)
+        self.cache.put(key, ans, ttl=RAG_FALLBACK_TTL_SECONDS)
+        return ans
+
+    def _search_done(self, key, generation: int, task: "asyncio.Future") -> None:
+        # runs on the event loop once the worker thread is done, however the request ended
+        self._embed_slots.release()
+        if task.cancelled() or task.exception() is not None:
+            return
+        # skip answers computed against data that has since been invalidated
+        if task.result() is not None and generation == self._generation:
+            self.cache.put(key, task.result())
+
+    def _db_query(self, q: str, top_k: int) -> Optional[str]:
+        """Worker side of aquery: build if needed, then search. The caller holds an embedding slot."""
+        # profiled here, in the search thread, since that's where a slow FAQ request spends its time
+        with metrics.profile_if_slow("faq_search"):
+            self.build()
+            if self.db is None:
+                return None
+            return self._similarity_search(q, top_k)
+
+    def _query_uncached(self, q: str, top_k: int) -> str:
+        """
+        If vector DB available, use similarity_search.
+        Otherwise, fall back to BM25 keyword ranking.
+        """
+        self.build()
+        if self.use_db and self.db is not None:
+            ans = self._vector_query(q, top_k)
+            if ans is not None:
+                return ans
+        return self._keyword_query(q, top_k)
+
+    def _vector_query(self, q: str, top_k: int) -> Optional[str]:
+        """Blocking vector search for the sync path; waits for a free embedding slot."""
+        with self._embed_slots:
+            return self._similarity_search(q, top_k)
+
+    def _similarity_search(self, q: str, top_k: int) -> Optional[str]:
+        """similarity_search (blocking: embeds the query); None if the DB call fails."""
+        with metrics.span("rag_vector"):
+            try:
+                res = self.db.similarity_search(q, k=top_k)
+            except Exception as e:
+                # fallback to simple search if DB call fails
+                print("RAG DB query failed:", e)
+                return None
+        out = []
+        for r in res:
+            if hasattr(r, "page_content"):
+                out.append(r.page_content)
+            else:
+                out.append(str(r))
+        return "\n\n".join(out) if out else NO_ANSWER
+
+    def _keyword_query(self, q: str, top_k: int) -> str:
+        # BM25 keyword ranking over the FAQ texts
+        with metrics.span("rag_keyword"):
+            top_texts = self.keyword_index.query(q, top_k)
+        if not top_texts:
+            return NO_ANSWER
+        return "\n\n".join(top_texts)
@@ -86,7 +86,7 @@ export default function ChatInterface({ inWidget = false }) {
             pushAgent(data.question);
         } else if (data.type === "suggest_slots") {
             setSuggestedSlots(data.slots || []);
-            pushAgent("I found some open slots — pick one from below.");
+            pushAgent(data.message || "I found some open slots — pick one from below.");
         } else if (data.type === "booking_conf") {
             const b = data.booking;
             // Pretty booking bubble per assessment
@@ -127,11 +127,12 @@ export default function ChatInterface({ inWidget = false }) {
         setShowModal(false);
         setSuggestedSlots([]);
 
-        pushUser(`Selected slot: ${selectedSlot.start_time} (${selectedSlot.end_time})`);
+        pushUser(`Selected slot: ${selectedSlot.date ? selectedSlot.date + " " : ""}${selectedSlot.start_time} (${selectedSlot.end_time})`);
 
+        // slots can span several days, so send the date along with the time
         await sendMessageRaw({
             session_id: sessionId,
-            message: selectedSlot.start_time,
+            message: selectedSlot.date ? `${selectedSlot.date} ${selectedSlot.start_time}` : selectedSlot.start_time,
         });
 
         const patientCsv = `${patient.name}, ${patient.phone}, ${patient.email}`;
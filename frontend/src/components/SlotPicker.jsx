@@ -28,6 +28,7 @@ export default function SlotPicker({ slots = [], onSelect, onCancel }) {
                             minWidth: 140,
                             textAlign: "center"
                         }}>
+                        {s.date && <div style={{ fontSize: 12, color: "#555" }}>{s.date}</div>}
                         <div style={{ fontWeight: 700 }}>{s.start_time}</div>
                         <div style={{ fontSize: 12, color: "#555" }}>{s.end_time}</div>
                     </button>